@@ -1 +1,15 @@
+import numpy as np
+
 from .dam_cls import Dam
+from . import _kernels
+
+# パッケージ読み込み時にJITコンパイルを済ませ、ディスクキャッシュを温めておく。
+try:
+    _dummy = np.zeros(2, dtype=np.float32)
+    _tab = np.zeros(2)
+    _kernels.dyn_w_kernel(_dummy, _dummy, 1.0, 0.14, 9.8, _tab, _tab,
+                          np.zeros(2, dtype=np.float32))
+    _kernels.mud_kernel(_dummy, _dummy, 1.0, 10.0, 0.5, 1.0,
+                        np.zeros(2, dtype=np.float32), np.zeros(2, dtype=np.float32))
+except Exception:
+    pass
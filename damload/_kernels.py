@@ -0,0 +1,58 @@
+"""Numbaで高速化した数値カーネル。"""
+import numpy as np
+import numba
+
+
+@numba.njit(cache=True, fastmath=True)
+def dyn_w_kernel(x, y, h, k, w, slant_tab, cm_tab, out):
+    """
+    Zangerの式による動水圧を一回のループで計算する。
+    傾斜角度の計算、Cm曲線の補間、Zangerの式を融合し、中間配列を作らない。
+    slant_tab / cm_tab は昇順で並んだ傾斜角度-Cm曲線。
+    結果は out に書き込む。
+    """
+    n = x.shape[0]
+    m = slant_tab.shape[0]
+    slant = 0.0
+    for i in range(n):
+        if i < n - 1:
+            dy = y[i + 1] - y[i]
+            if dy == 0.0:
+                dy = 1e-18
+            slant = np.degrees(np.arctan((x[i + 1] - x[i]) / dy))
+        # 最後の点は一つ前の傾斜角度を使う。
+        if slant <= slant_tab[0]:
+            cm = cm_tab[0]
+        elif slant >= slant_tab[m - 1]:
+            cm = cm_tab[m - 1]
+        else:
+            cm = cm_tab[m - 1]
+            for j in range(m - 1):
+                if slant <= slant_tab[j + 1]:
+                    ratio = (slant - slant_tab[j]) / (slant_tab[j + 1] - slant_tab[j])
+                    cm = cm_tab[j] + ratio * (cm_tab[j + 1] - cm_tab[j])
+                    break
+        dep_ratio = (h - y[i]) / h
+        dep_ratio = dep_ratio * (2.0 - dep_ratio)
+        dep_ratio = 0.5 * (dep_ratio + np.sqrt(dep_ratio))
+        out[i] = cm * dep_ratio * w * k * h
+    return out
+
+
+@numba.njit(cache=True, fastmath=True)
+def mud_kernel(x, y, h, w, ce, mesh_size, pv_out, ph_out):
+    """
+    泥圧の鉛直・水平成分を一回のループで計算する。
+    傾斜角度をラジアンのまま使い、度への往復変換と中間配列を作らない。
+    結果は pv_out と ph_out に書き込む。
+    """
+    n = x.shape[0]
+    slant = 0.0
+    for i in range(n):
+        if i < n - 1:
+            slant = np.arctan2(x[i + 1] - x[i], y[i + 1] - y[i])
+        # 最後の点は一つ前の傾斜角度を使う。
+        depth = h - y[i]
+        pv_out[i] = w * depth * np.sin(slant) * mesh_size
+        ph_out[i] = ce * w * depth * np.cos(slant) * mesh_size
+    return pv_out, ph_out
@@ -1,17 +1,16 @@
 import numpy as np
-from scipy import interpolate
 
 
-def buoyancy(hu: float, hd: float, length: float, loc_drain=None, w=9.8, offset=1.1):
+def buoyancy_knots(hu: float, hd: float, length: float, loc_drain=None, w=9.8, offset=1.1):
     """
-    揚圧力を計算する。
+    揚圧力分布の折れ点を計算する。
     :param hu: 上流側の水深(m)
     :param hd: 下流側の水深(m)
     :param length: 堤体の底の長さ(m)
     :param loc_drain: 排水孔から上流側までの距離(m)
     :param w: 水の単位体積重量
     :param offset: 1 より大きい。
-    :return: 上流側から求めようとする点まで距離による関数
+    :return: 折れ点の距離と揚圧力の配列
     """
     pu = hu * w
     pd = hd * w
@@ -28,6 +27,28 @@ def buoyancy(hu: float, hd: float, length: float, loc_drain=None, w=9.8, offset=
         p_down = pd
         dis = np.array([0, loc_drain, length], dtype=float)
         pressure = np.array([p_up, p_drain, p_down], dtype=float)
+    return dis, pressure
+
+
+def buoyancy_eval(x, hu: float, hd: float, length: float, loc_drain=None, w=9.8, offset=1.1):
+    """
+    指定した距離 x における揚圧力を直接計算する。
+    パラメーターは buoyancy_knots と同じ。
+    :return: x に対応する揚圧力の配列
+    """
+    dis, pressure = buoyancy_knots(hu=hu, hd=hd, length=length, loc_drain=loc_drain, w=w, offset=offset)
+    return np.interp(x, dis, pressure)
+
+
+def buoyancy(hu: float, hd: float, length: float, loc_drain=None, w=9.8, offset=1.1):
+    """
+    揚圧力を計算する。
+    パラメーターは buoyancy_knots と同じ。
+    :return: 上流側から求めようとする点まで距離による関数
+    """
+    dis, pressure = buoyancy_knots(hu=hu, hd=hd, length=length, loc_drain=loc_drain, w=w, offset=offset)
+
+    def f(x):
+        return np.interp(x, dis, pressure)
 
-    f = interpolate.interp1d(x=dis, y=pressure)
     return f
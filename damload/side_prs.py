@@ -1,22 +1,26 @@
 import numpy as np
 from numpy.typing import NDArray
-from scipy import interpolate
+from damload import _kernels
 
 
 def cal_slant(x: NDArray, y: NDArray) -> NDArray:
     """傾斜角度を計算する"""
-    diff_y = np.diff(y)
-    diff_y[diff_y == 0] = 1e-18
-    slant = np.arctan(np.diff(x) / diff_y)
-    slant = np.append(slant, slant[-1])
-    slant = np.rad2deg(slant)
-    return slant
+    # arctan2 は分母ゼロも扱えるため、ゼロ除算の前処理が要らない。
+    # バッファを先に確保し、結合による再割り当てを避ける。
+    slant = np.empty(len(x), dtype=np.float64)
+    np.arctan2(np.diff(x), np.diff(y), out=slant[:-1])
+    slant[-1] = slant[-2]
+    return np.degrees(slant, out=slant)
 
 
-# Zanger式の傾斜角度-Cm曲線
-expr_slant = np.array([90, 80, 70, 60, 50, 40, 30, 20, 10, 0], dtype=float)
-expr_cm = np.array([0.025, 0.125, 0.225, 0.31, 0.4, 0.48, 0.55, 0.62, 0.67, 0.72], dtype=float)
-zanger_cm = interpolate.interp1d(x=expr_slant, y=expr_cm)  # 傾斜角度からCmを計算する関数。
+# Zanger式の傾斜角度-Cm曲線 (np.interp のため昇順で並べる)
+expr_slant = np.array([0, 10, 20, 30, 40, 50, 60, 70, 80, 90], dtype=float)
+expr_cm = np.array([0.72, 0.67, 0.62, 0.55, 0.48, 0.4, 0.31, 0.225, 0.125, 0.025], dtype=float)
+
+
+def zanger_cm(slant: NDArray) -> NDArray:
+    """傾斜角度からCmを計算する。"""
+    return np.interp(slant, expr_slant, expr_cm)
 
 
 def zanger(cm: NDArray, dep: NDArray, h: float, k: float, w=9.8) -> NDArray:
@@ -29,19 +33,20 @@ def zanger(cm: NDArray, dep: NDArray, h: float, k: float, w=9.8) -> NDArray:
     k: 堤体の設計震度。
     :return: Zangerの式による動水圧。
     """
+    # 一つの作業バッファ上で計算し、中間配列を減らす。
     dep_ratio = dep / h
-    dep_ratio = dep_ratio * (2 - dep_ratio)
-    dep_ratio = 0.5 * (dep_ratio + np.sqrt(dep_ratio))
-    c_val = cm * dep_ratio
-    pd = c_val * w * k * h
-    return pd
+    np.multiply(dep_ratio, 2 - dep_ratio, out=dep_ratio)
+    np.add(dep_ratio, np.sqrt(dep_ratio), out=dep_ratio)
+    dep_ratio *= cm
+    dep_ratio *= 0.5 * w * k * h
+    return dep_ratio
 
 
 def dyn_w(x, y, h, k, w=9.8):
-    slant = cal_slant(x, y)
-    cm_val = zanger_cm(slant)
-    depth = h - y
-    prs = zanger(cm=cm_val, dep=depth, h=h, k=k, w=w)
+    x = np.ascontiguousarray(x)
+    y = np.ascontiguousarray(y)
+    prs = np.empty_like(y)
+    _kernels.dyn_w_kernel(x, y, h, k, w, expr_slant, expr_cm, prs)
     return prs
 
 
@@ -87,14 +92,14 @@ def mud(x, y, h, mesh_size=None, w=12.0, ce=0.5):
     :param mesh_size: 結果を集中力に換算するしたいと, メッシュの大きさを設定する。
     :return: 鉛直と水平に作用する泥圧(KN/m2)
     """
-    depth = h - y
-    slant = cal_slant(x, y)
-    slant = np.deg2rad(slant)
     if isinstance(mesh_size, (int, float)):
-        scaling_v = np.sin(slant) * mesh_size
-        scaling_h = np.cos(slant) * mesh_size
+        x = np.ascontiguousarray(x)
+        y = np.ascontiguousarray(y)
+        pv = np.empty_like(y)
+        ph = np.empty_like(y)
+        _kernels.mud_kernel(x, y, h, w, ce, float(mesh_size), pv, ph)
     else:
-        scaling_v, scaling_h = (1, 1)
-    pv = w * depth * scaling_v
-    ph = ce * w * depth * scaling_h
+        depth = h - y
+        pv = w * depth
+        ph = ce * w * depth
     return pv, ph